@@ -3,9 +3,12 @@
 # This file is released under the GNU GPL, version 3 or a later revision.
 # For further details see the COPYING file
 import argparse
+import asyncio
+import codecs
 import logging
 import mailcap
 import os
+import re
 import subprocess
 import tempfile
 import email
@@ -24,13 +27,14 @@ from .globals import MoveCommand
 from .globals import CommandCanceled
 from .common import RetagPromptCommand
 from .envelope import SendCommand
+from ..account import Address
 from ..completion.contacts import ContactsCompleter
 from ..completion.path import PathCompleter
 from ..db.utils import decode_header
 from ..db.utils import formataddr
 from ..db.utils import get_body_part
 from ..db.utils import extract_headers
-from ..db.utils import clear_my_address
+from ..db.utils import clear_my_address_multi
 from ..db.utils import ensure_unique_address
 from ..db.envelope import Envelope
 from ..db.attachment import Attachment
@@ -44,8 +48,95 @@ from ..widgets.globals import AttachmentWidget
 
 MODE = 'thread'
 
+# argument specifications shared by several commands below
+_QUERY_ARG = (['query'], {'help': 'query used to filter messages to affect',
+                          'nargs': '*'})
+_SPAWN_ARG = (['--spawn'], {'action': cargparse.BooleanAction,
+                            'default': None,
+                            'help': 'open editor in new window'})
 
-def determine_sender(mail, action='reply'):
+# characters that make a command string depend on the shell to interpret it
+_SHELL_META = re.compile(r'[\n;&|<>$`"\'\\*?\[\]{}()#~!]')
+
+
+class _HeaderSnapshot:
+    """
+    headers of a mail, collected in a single pass over its raw header list.
+
+    Values are only parsed by the mail's policy when they are looked up, so
+    the many headers a reply or forward never looks at (Received,
+    DKIM-Signature, ...) don't cost anything.
+    """
+
+    def __init__(self, mail):
+        """
+        :param mail: the email to inspect
+        :type mail: `email.message.Message`
+        """
+        self._policy = mail.policy
+        self._raw = {}
+        self._parsed = {}
+        for key, value in mail.raw_items():
+            self._raw.setdefault(key.lower(), []).append((key, value))
+
+    def __contains__(self, name):
+        return name.lower() in self._raw
+
+    def get(self, name, default=None):
+        """
+        return all values of header `name` as a list, or `default` if the
+        mail has no such header
+
+        :param name: header name, case insensitive
+        :type name: str
+        """
+        name = name.lower()
+        if name not in self._raw:
+            return default
+        if name not in self._parsed:
+            self._parsed[name] = [self._policy.header_fetch_parse(k, v)
+                                  for k, v in self._raw[name]]
+        return self._parsed[name]
+
+
+def _account_index(accounts):
+    """
+    map the addresses and aliases of accounts to the position of the first
+    account that uses them
+
+    :param accounts: accounts in order of preference
+    :type accounts: list of :class:`~alot.account.Account`
+    :rtype: dict (:class:`~alot.account.Address` -> int)
+    """
+    index = {}
+    for position, account in enumerate(accounts):
+        for address in [account.address] + account.aliases:
+            index.setdefault(address, position)
+    return index
+
+
+def _lookup_account(index, address):
+    """
+    return the position of the first account in `index` that uses `address`
+    literally, or `None` if there is no such account
+
+    :param index: as returned by :func:`_account_index`
+    :type index: dict
+    :param address: email address without realname
+    :type address: str
+    :rtype: int or None
+    """
+    try:
+        # keys compare according to their own case sensitivity but hash it,
+        # so look up both variants
+        keys = [Address.from_string(address, case_sensitive=cs)
+                for cs in (False, True)]
+    except ValueError:
+        return None
+    return min((index[k] for k in keys if k in index), default=None)
+
+
+def determine_sender(mail, action='reply', headers=None):
     """
     Inspect a given mail to reply/forward/bounce and find the most appropriate
     account to act from and construct a suitable From-Header to use.
@@ -54,6 +145,8 @@ def determine_sender(mail, action='reply'):
     :type mail: `email.message.Message`
     :param action: intended use case: one of "reply", "forward" or "bounce"
     :type action: str
+    :param headers: headers of `mail`, if already collected
+    :type headers: :class:`_HeaderSnapshot`
     """
     assert action in ['reply', 'forward', 'bounce']
 
@@ -68,29 +161,56 @@ def determine_sender(mail, action='reply'):
     # account X, with account Y in e.g. CC or delivered-to, make sure that
     # account X is the one selected and not account Y.
     candidate_headers = settings.get("reply_account_header_priority")
+    force_realname = settings.get(action + '_force_realname')
+    force_address = settings.get(action + '_force_address')
+    # addresses and aliases are looked up in a table, only accounts with an
+    # alias_regexp need to be matched against each candidate address
+    index = _account_index(my_accounts)
+    regexp_accounts = [(position, account)
+                       for position, account in enumerate(my_accounts)
+                       if account.alias_regexp]
     for candidate_header in candidate_headers:
-        candidate_addresses = getaddresses(mail.get_all(candidate_header, []))
+        if headers is None:
+            values = mail.get_all(candidate_header)
+        else:
+            values = headers.get(candidate_header.lower())
+        if not values:
+            continue
+        candidate_addresses = getaddresses(values)
 
         logging.debug('candidate addresses: %s', candidate_addresses)
         # pick the most important account that has an address in candidates
         # and use that account's realname and the address found here
-        for account in my_accounts:
-            for seen_name, seen_address in candidate_addresses:
+        found = None
+        for seen_name, seen_address in candidate_addresses:
+            position = _lookup_account(index, seen_address)
+            for rposition, account in regexp_accounts:
+                if position is not None and rposition >= position:
+                    break
                 if account.matches_address(seen_address):
-                    if settings.get(action + '_force_realname'):
-                        realname = account.realname
-                    else:
-                        realname = seen_name
-                    if settings.get(action + '_force_address'):
-                        address = str(account.address)
-                    else:
-                        address = seen_address
+                    position = rposition
+                    break
+            if position is not None and (found is None or
+                                         position < found[0]):
+                found = position, seen_name, seen_address
+
+        if found is not None:
+            position, seen_name, seen_address = found
+            account = my_accounts[position]
+            if force_realname:
+                realname = account.realname
+            else:
+                realname = seen_name
+            if force_address:
+                address = str(account.address)
+            else:
+                address = seen_address
 
-                    logging.debug('using realname: "%s"', realname)
-                    logging.debug('using address: %s', address)
+            logging.debug('using realname: "%s"', realname)
+            logging.debug('using address: %s', address)
 
-                    from_value = formataddr((realname, address))
-                    return from_value, account
+            from_value = formataddr((realname, address))
+            return from_value, account
 
     # revert to default account if nothing found
     account = my_accounts[0]
@@ -107,8 +227,7 @@ def determine_sender(mail, action='reply'):
     (['--all'], {'action': 'store_true', 'help': 'reply to all'}),
     (['--list'], {'action': cargparse.BooleanAction, 'default': None,
                   'dest': 'listreply', 'help': 'reply to list'}),
-    (['--spawn'], {'action': cargparse.BooleanAction, 'default': None,
-                   'help': 'open editor in new window'})])
+    _SPAWN_ARG])
 class ReplyCommand(Command):
 
     """reply to message"""
@@ -138,9 +257,13 @@ class ReplyCommand(Command):
         if not self.message:
             self.message = ui.current_buffer.get_selected_message()
         mail = self.message.get_email()
+        hdrs = _HeaderSnapshot(mail)
+        from_hdr = hdrs.get('from', [None])[0]
+        reply_to = hdrs.get('reply-to', [None])[0]
+        list_id = hdrs.get('list-id', [None])[0]
 
         # set body text
-        name, address = parseaddr(mail['From'])
+        name, address = parseaddr(from_hdr)
         timestamp = self.message.get_date()
         qf = settings.get_hook('reply_prefix')
         if qf:
@@ -155,28 +278,30 @@ class ReplyCommand(Command):
             mailcontent += quotehook(body_text)
         else:
             quote_prefix = settings.get('quote_prefix')
-            for line in body_text.splitlines():
-                mailcontent += quote_prefix + line + '\n'
+            mailcontent += ''.join(quote_prefix + line + '\n'
+                                   for line in body_text.splitlines())
 
         envelope = Envelope(bodytext=mailcontent, replied=self.message)
 
         # copy subject
-        subject = decode_header(mail.get('Subject', ''))
+        subject = decode_header(hdrs.get('subject', [''])[0])
         reply_subject_hook = settings.get_hook('reply_subject')
         if reply_subject_hook:
             subject = reply_subject_hook(subject)
         else:
             rsp = settings.get('reply_subject_prefix')
-            if not subject.lower().startswith(('re:', rsp.lower())):
+            # only lowercase as much of the subject as needed for the test
+            head = subject[:max(3, len(rsp))].lower()
+            if not head.startswith(('re:', rsp.lower())):
                 subject = rsp + subject
         envelope.add('Subject', subject)
 
         # Auto-detect ML
         auto_replyto_mailinglist = settings.get('auto_replyto_mailinglist')
-        if mail['List-Id'] and self.listreply is None:
+        if list_id and self.listreply is None:
             # mail['List-Id'] is need to enable reply-to-list
             self.listreply = auto_replyto_mailinglist
-        elif mail['List-Id'] and self.listreply is True:
+        elif list_id and self.listreply is True:
             self.listreply = True
         elif self.listreply is False:
             # In this case we only need the sender
@@ -184,7 +309,7 @@ class ReplyCommand(Command):
 
         # set From-header and sending account
         try:
-            from_header, account = determine_sender(mail, 'reply')
+            from_header, account = determine_sender(mail, 'reply', hdrs)
         except AssertionError as e:
             ui.notify(str(e), priority='error')
             return
@@ -192,13 +317,14 @@ class ReplyCommand(Command):
         envelope.account = account
 
         # set To
-        sender = mail['Reply-To'] or mail['From']
+        sender = reply_to or from_hdr
         sender_address = parseaddr(sender)[1]
+        replying_to_self = account.matches_address(sender_address)
         cc = []
 
         # check if reply is to self sent message
-        if account.matches_address(sender_address):
-            recipients = mail.get_all('To', [])
+        if replying_to_self:
+            recipients = list(hdrs.get('to', []))
             emsg = 'Replying to own message, set recipients to: %s' \
                 % recipients
             logging.debug(emsg)
@@ -208,25 +334,25 @@ class ReplyCommand(Command):
         if self.groupreply:
             # make sure that our own address is not included
             # if the message was self-sent, then our address is not included
-            MFT = mail.get_all('Mail-Followup-To', [])
-            followupto = clear_my_address(account, MFT)
+            cleared = clear_my_address_multi(
+                account, mft=hdrs.get('mail-followup-to', []),
+                to=hdrs.get('to', []), cc=hdrs.get('cc', []))
+            followupto = cleared['mft']
             if followupto and settings.get('honor_followup_to'):
                 logging.debug('honor followup to: %s', ', '.join(followupto))
                 recipients = followupto
                 # since Mail-Followup-To was set, ignore the Cc header
             else:
-                if sender != mail['From']:
-                    recipients.append(mail['From'])
+                if sender != from_hdr:
+                    recipients.append(from_hdr)
 
                 # append To addresses if not replying to self sent message
-                if not account.matches_address(sender_address):
-                    cleared = clear_my_address(account,
-                                               mail.get_all('To', []))
-                    recipients.extend(cleared)
+                if not replying_to_self:
+                    recipients.extend(cleared['to'])
 
                 # copy cc for group-replies
-                if 'Cc' in mail:
-                    cc = clear_my_address(account, mail.get_all('Cc', []))
+                if 'cc' in hdrs:
+                    cc = cleared['cc']
                     envelope.add('Cc', decode_header(', '.join(cc)))
 
         to = ', '.join(ensure_unique_address(recipients))
@@ -237,12 +363,13 @@ class ReplyCommand(Command):
             # Reply-To is standart reply target RFC 2822:, RFC 1036: 2.2.1
             # X-BeenThere is needed by sourceforge ML also winehq
             # X-Mailing-List is also standart and is used by git-send-mail
-            to = mail['Reply-To'] or mail['X-BeenThere'] or mail['X-Mailing-List']
+            to = (reply_to or hdrs.get('x-beenthere', [None])[0] or
+                  hdrs.get('x-mailing-list', [None])[0])
 
             # Some mail server (gmail) will not resend you own mail, so you
             # have to deal with the one in sent
             if to is None:
-                to = mail['To']
+                to = hdrs.get('to', [None])[0]
             logging.debug('mail list reply to: %s', to)
             # Cleaning the 'To' in this case
             if envelope.get('To') is not None:
@@ -256,27 +383,29 @@ class ReplyCommand(Command):
         if settings.get('followup_to'):
             # to and cc are already cleared of our own address
             allrecipients = [to] + cc
-            lists = settings.get('mailinglists')
+            lists = settings.get_mailinglists()
             # check if any recipient address matches a known mailing list
-            if any(addr in lists for n, addr in getaddresses(allrecipients)):
+            if any(addr.lower() in lists
+                   for n, addr in getaddresses(allrecipients)):
                 followupto = ', '.join(allrecipients)
                 logging.debug('mail followup to: %s', followupto)
                 envelope.add('Mail-Followup-To', decode_header(followupto))
 
         # set In-Reply-To header
-        envelope.add('In-Reply-To', '<%s>' % self.message.get_message_id())
+        msgid = '<%s>' % self.message.get_message_id()
+        envelope.add('In-Reply-To', msgid)
 
-        # set References header
-        old_references = mail.get('References', '')
+        # set References header: keep the first and the last 8 references.
+        # rsplit only tokenizes the tail of (possibly very long) chains.
+        old_references = hdrs.get('references', [''])[0]
         if old_references:
-            old_references = old_references.split()
-            references = old_references[-8:]
-            if len(old_references) > 8:
-                references = old_references[:1] + references
-            references.append('<%s>' % self.message.get_message_id())
+            references = old_references.rsplit(maxsplit=8)
+            if len(references) > 8:
+                references[0] = references[0].split(maxsplit=1)[0]
+            references.append(msgid)
             envelope.add('References', ' '.join(references))
         else:
-            envelope.add('References', '<%s>' % self.message.get_message_id())
+            envelope.add('References', msgid)
 
         # continue to compose
         encrypt = mail.get_content_subtype() == 'encrypted'
@@ -287,8 +416,7 @@ class ReplyCommand(Command):
 
 @registerCommand(MODE, 'forward', arguments=[
     (['--attach'], {'action': 'store_true', 'help': 'attach original mail'}),
-    (['--spawn'], {'action': cargparse.BooleanAction, 'default': None,
-                   'help': 'open editor in new window'})])
+    _SPAWN_ARG])
 class ForwardCommand(Command):
 
     """forward message"""
@@ -329,12 +457,13 @@ class ForwardCommand(Command):
                     name or address, timestamp)
             mailcontent = quote
             quotehook = settings.get_hook('text_quote')
+            body_text = self.message.get_body_text()
             if quotehook:
-                mailcontent += quotehook(self.message.get_body_text())
+                mailcontent += quotehook(body_text)
             else:
                 quote_prefix = settings.get('quote_prefix')
-                for line in self.message.get_body_text().splitlines():
-                    mailcontent += quote_prefix + line + '\n'
+                mailcontent += ''.join(quote_prefix + line + '\n'
+                                       for line in body_text.splitlines())
 
             envelope.body_txt = mailcontent
 
@@ -346,11 +475,16 @@ class ForwardCommand(Command):
             original_mail = Message()
             original_mail.set_type('message/rfc822')
             original_mail['Content-Disposition'] = 'attachment'
+            # serialize once into a str payload: Attachment sizes and saves
+            # its payload as data, and the envelope deep-copies attachment
+            # parts when it is sent, which is free for an immutable str but
+            # not for a nested Message payload
             original_mail.set_payload(mail.as_string(policy=email.policy.SMTP))
             envelope.attach(Attachment(original_mail))
 
         # copy subject
-        subject = decode_header(mail.get('Subject', ''))
+        hdrs = _HeaderSnapshot(mail)
+        subject = decode_header(hdrs.get('subject', [''])[0])
         subject = 'Fwd: ' + subject
         forward_subject_hook = settings.get_hook('forward_subject')
         if forward_subject_hook:
@@ -362,12 +496,13 @@ class ForwardCommand(Command):
         envelope.add('Subject', subject)
 
         # Set forwarding reference headers
-        envelope.add('References', '<%s>' % self.message.get_message_id())
-        envelope.add('X-Forwarded-Message-Id', '<%s>' % self.message.get_message_id())
+        msgid = '<%s>' % self.message.get_message_id()
+        envelope.add('References', msgid)
+        envelope.add('X-Forwarded-Message-Id', msgid)
 
         # set From-header and sending account
         try:
-            from_header, account = determine_sender(mail, 'reply')
+            from_header, account = determine_sender(mail, 'reply', hdrs)
         except AssertionError as e:
             ui.notify(str(e), priority='error')
             return
@@ -405,12 +540,17 @@ class BounceMailCommand(Command):
             ui.notify('no accounts set', priority='error')
             return
 
-        # remove "Resent-*" headers if already present
-        del mail['Resent-From']
-        del mail['Resent-To']
-        del mail['Resent-Cc']
-        del mail['Resent-Date']
-        del mail['Resent-Message-ID']
+        # remove "Resent-*" headers if already present, in a single pass over
+        # the header list instead of one per header if possible
+        resent = ('Resent-From', 'Resent-To', 'Resent-Cc', 'Resent-Date',
+                  'Resent-Message-ID')
+        if isinstance(getattr(mail, '_headers', None), list):
+            resent = {h.lower() for h in resent}
+            mail._headers = [(k, v) for k, v in mail._headers
+                             if k.lower() not in resent]
+        else:
+            for header in resent:
+                del mail[header]
 
         # set Resent-From-header and sending account
         try:
@@ -443,9 +583,7 @@ class BounceMailCommand(Command):
         await ui.apply_command(SendCommand(mail=mail))
 
 
-@registerCommand(MODE, 'editnew', arguments=[
-    (['--spawn'], {'action': cargparse.BooleanAction, 'default': None,
-                   'help': 'open editor in new window'})])
+@registerCommand(MODE, 'editnew', arguments=[_SPAWN_ARG])
 class EditNewCommand(Command):
 
     """edit message in as new"""
@@ -498,22 +636,18 @@ class EditNewCommand(Command):
 
 @registerCommand(
     MODE, 'fold', help='fold message(s)', forced={'visible': False},
-    arguments=[(['query'], {'help': 'query used to filter messages to affect',
-                            'nargs': '*'})])
+    arguments=[_QUERY_ARG])
 @registerCommand(
     MODE, 'unfold', help='unfold message(s)', forced={'visible': True},
-    arguments=[(['query'], {'help': 'query used to filter messages to affect',
-                            'nargs': '*'})])
+    arguments=[_QUERY_ARG])
 @registerCommand(
     MODE, 'togglesource', help='display message source',
     forced={'raw': 'toggle'},
-    arguments=[(['query'], {'help': 'query used to filter messages to affect',
-                            'nargs': '*'})])
+    arguments=[_QUERY_ARG])
 @registerCommand(
     MODE, 'toggleheaders', help='display all headers',
     forced={'all_headers': 'toggle'},
-    arguments=[(['query'], {'help': 'query used to filter messages to affect',
-                            'nargs': '*'})])
+    arguments=[_QUERY_ARG])
 @registerCommand(
     MODE, 'indent', help='change message/reply indentation',
     arguments=[(['indent'], {'action': cargparse.ValidatedStoreAction,
@@ -521,13 +655,11 @@ class EditNewCommand(Command):
 @registerCommand(
     MODE, 'togglemimetree', help='disply mime tree of the message',
     forced={'mimetree': 'toggle'},
-    arguments=[(['query'], {'help': 'query used to filter messages to affect',
-                            'nargs': '*'})])
+    arguments=[_QUERY_ARG])
 @registerCommand(
     MODE, 'togglemimepart', help='switch between html and plain text message',
     forced={'mimepart': 'toggle'},
-    arguments=[(['query'], {'help': 'query used to filter messages to affect',
-                            'nargs': '*'})])
+    arguments=[_QUERY_ARG])
 class ChangeDisplaymodeCommand(Command):
 
     """fold or unfold messages"""
@@ -558,13 +690,13 @@ class ChangeDisplaymodeCommand(Command):
         self.indent = indent
         self.mimetree = mimetree
         self.mimepart = mimepart
+        self._matching = None  # ids of messages matching query, if any
         Command.__init__(self, **kwargs)
 
     def _matches(self, msgt):
-        if self.query is None or self.query == '*':
+        if self._matching is None:
             return True
-        msg = msgt.get_message()
-        return msg.matches(self.query)
+        return msgt.get_message().get_message_id() in self._matching
 
     def apply(self, ui):
         tbuffer = ui.current_buffer
@@ -590,37 +722,50 @@ class ChangeDisplaymodeCommand(Command):
             messagetrees = [tbuffer.get_selected_messagetree()]
         else:
             messagetrees = tbuffer.messagetrees()
+            if self.query != '*':
+                # look up all matching messages of this thread at once
+                # instead of querying the index for every message
+                querystring = '( {} ) AND thread:{}'.format(
+                    self.query, tbuffer.get_selected_thread().get_thread_id())
+                self._matching = ui.dbman.get_message_ids(querystring)
+
+        # these are the same for all message trees
+        toggle_visible = self.visible == 'toggle'
+        toggle_raw = self.raw == 'toggle'
+        toggle_all_headers = self.all_headers == 'toggle'
+        toggle_mimetree = self.mimetree == 'toggle'
+        toggle_mimepart = self.mimepart == 'toggle'
 
         for mt in messagetrees:
             # determine new display values for this message
-            if self.visible == 'toggle':
+            if toggle_visible:
                 visible = mt.is_collapsed(mt.root)
             else:
                 visible = self.visible
             if not self._matches(mt):
                 visible = not visible
 
-            if self.raw == 'toggle':
+            if toggle_raw:
                 tbuffer.focus_selected_message()
-            raw = not mt.display_source if self.raw == 'toggle' else self.raw
+            raw = not mt.display_source if toggle_raw else self.raw
             all_headers = not mt.display_all_headers \
-                if self.all_headers == 'toggle' else self.all_headers
+                if toggle_all_headers else self.all_headers
             if self.mimepart:
-                if self.mimepart == 'toggle':
+                if toggle_mimepart:
                     message = mt.get_message()
                     mimepart = message.get_mime_part()
                     if mimepart is not None:
                         mimetype = {'plain': 'html', 'html': 'plain'}[
-                            message.get_mime_part().get_content_subtype()]
+                            mimepart.get_content_subtype()]
                         mimepart = get_body_part(message.get_email(), mimetype)
                 elif self.mimepart is True:
                     mimepart = ui.get_deep_focus().mimepart
                 mt.set_mimepart(mimepart)
                 ui.update()
-            if self.mimetree == 'toggle':
+            if toggle_mimetree:
                 tbuffer.focus_selected_message()
             mimetree = not mt.display_mimetree \
-                if self.mimetree == 'toggle' else self.mimetree
+                if toggle_mimetree else self.mimetree
 
             # collapse/expand depending on new 'visible' value
             if visible is False:
@@ -712,10 +857,36 @@ class PipeCommand(Command):
         self.output_format = format
         self.add_tags = add_tags
         self.strip_ansi = strip_ansi
+        # the command string is passed to the shell. Unless the shell was
+        # explicitly asked for, run the command directly if the shell has
+        # nothing to interpret in it.
+        self._argv = None
+        if cmd and not shell:
+            if not _SHELL_META.search(cmd[0]):
+                argv = split_commandstring(cmd[0])
+                # leading variable assignments need the shell as well
+                if argv and '=' not in argv[0]:
+                    self._argv = argv
         self.noop_msg = noop_msg
         self.confirm_msg = confirm_msg
         self.done_msg = done_msg
 
+    def _get_pipestring(self, msg):
+        """
+        returns the content of `msg` to pipe in 'raw' or 'decoded' format.
+        Raw mails are returned as bytes.
+        """
+        mail = msg.get_email()
+        if self.add_tags:
+            mail.add_header('Tags', ', '.join(msg.get_tags()))
+        if self.output_format == 'raw':
+            # flatten directly to bytes instead of creating a str copy of
+            # the whole mail (including attachments) first
+            return mail.as_bytes()
+        headertext = extract_headers(mail)
+        bodytext = msg.get_body_text()
+        return '%s\n\n%s' % (headertext, bodytext)
+
     async def apply(self, ui):
         # abort if command unset
         if not self.cmd:
@@ -750,36 +921,49 @@ class PipeCommand(Command):
             pipestrings = [e.get_filename() for e in to_print]
             separator = '\n'
         else:
-            for msg in to_print:
-                mail = msg.get_email()
-                if self.add_tags:
-                    mail.add_header('Tags', ', '.join(msg.get_tags()))
-                if self.output_format == 'raw':
-                    pipestrings.append(mail.as_string())
-                elif self.output_format == 'decoded':
-                    headertext = extract_headers(mail)
-                    bodytext = msg.get_body_text()
-                    msgtext = '%s\n\n%s' % (headertext, bodytext)
-                    pipestrings.append(msgtext)
+            # reading, decrypting and rendering the message files is done
+            # concurrently in the default executor
+            loop = asyncio.get_event_loop()
+            pipestrings = await asyncio.gather(*[
+                loop.run_in_executor(None, self._get_pipestring, msg)
+                for msg in to_print])
 
         if self.strip_ansi:
-            pipestrings = [ansi.strip_ansi_escapes(s) for s in pipestrings]
-
+            pipestrings = [ansi.strip_ansi_escapes_bytes(s)
+                           if isinstance(s, bytes)
+                           else ansi.strip_ansi_escapes(s)
+                           for s in pipestrings]
+
+        # look up the codec once rather than by name for every string
+        encode = codecs.getencoder(urwid.util.detected_encoding)
+        encoded_mails = [s if isinstance(s, bytes) else encode(s)[0]
+                         for s in pipestrings]
         if not self.separately:
-            pipestrings = [separator.join(pipestrings)]
+            encoded_mails = [encode(separator)[0].join(encoded_mails)]
         if self.shell:
             self.cmd = [' '.join(self.cmd)]
 
         # do the monkey
-        for mail in pipestrings:
-            encoded_mail = mail.encode(urwid.util.detected_encoding)
+        for encoded_mail in encoded_mails:
             if self.background:
                 logging.debug('call in background: %s', self.cmd)
-                proc = subprocess.Popen(self.cmd,
-                                        shell=True, stdin=subprocess.PIPE,
-                                        stdout=subprocess.PIPE,
-                                        stderr=subprocess.PIPE)
-                out, err = proc.communicate(encoded_mail)
+                # don't block the event loop while the command consumes
+                # its input, the interface is still running
+                if self._argv:
+                    _cmd = asyncio.create_subprocess_exec
+                    cmdlist = self._argv
+                else:
+                    _cmd = asyncio.create_subprocess_shell
+                    cmdlist = self.cmd[:1]
+                try:
+                    proc = await _cmd(*cmdlist,
+                                      stdin=subprocess.PIPE,
+                                      stdout=subprocess.PIPE,
+                                      stderr=subprocess.PIPE)
+                except OSError as e:
+                    ui.notify(str(e), priority='error')
+                    return
+                out, err = await proc.communicate(encoded_mail)
                 if self.notify_stdout:
                     ui.notify(out)
             else:
@@ -787,11 +971,16 @@ class PipeCommand(Command):
                     logging.debug('call: %s', self.cmd)
                     # if proc.stdout is defined later calls to communicate
                     # seem to be non-blocking!
-                    proc = subprocess.Popen(self.cmd, shell=True,
-                                            stdin=subprocess.PIPE,
-                                            # stdout=subprocess.PIPE,
-                                            stderr=subprocess.PIPE)
-                    out, err = proc.communicate(encoded_mail)
+                    try:
+                        proc = subprocess.Popen(self._argv or self.cmd,
+                                                shell=not self._argv,
+                                                stdin=subprocess.PIPE,
+                                                # stdout=subprocess.PIPE,
+                                                stderr=subprocess.PIPE)
+                    except OSError as e:
+                        err = str(e)
+                    else:
+                        out, err = proc.communicate(encoded_mail)
             if err:
                 ui.notify(err, priority='error')
                 return
@@ -841,8 +1030,7 @@ class RemoveCommand(Command):
             ui.notify(ok_msg)
 
         # remove messages
-        for m in messages:
-            ui.dbman.remove_message(m, afterwards=callback)
+        ui.dbman.remove_messages(list(messages), afterwards=callback)
 
         await ui.apply_command(FlushCommand())
 
@@ -925,8 +1113,12 @@ class SaveAttachmentCommand(Command):
                                             completer=pcomplete)
             if self.path:
                 if os.path.isdir(os.path.expanduser(self.path)):
+                    # decoding and writing large attachments takes a while,
+                    # keep the interface responsive meanwhile
+                    loop = asyncio.get_event_loop()
                     for a in msg.get_attachments():
-                        dest = a.save(self.path)
+                        dest = await loop.run_in_executor(None, a.save,
+                                                          self.path)
                         name = a.get_filename()
                         if name:
                             ui.notify('saved %s as: %s' % (name, dest))
@@ -1071,7 +1263,7 @@ class MoveFocusCommand(MoveCommand):
         # TODO add 'next matching' if threadbuffer stores the original query
         # TODO: add next by date..
 
-        if original_focus != ui.get_deep_focus():
+        if ui.get_deep_focus() is not original_focus:
             ui.update()
 
 
@@ -115,8 +115,8 @@ class DBManager:
                             logging.debug('thaw')
 
                         elif cmd == 'remove':
-                            path = current_item[2]
-                            db.remove(path)
+                            for path in current_item[2]:
+                                db.remove(path)
 
                         elif cmd == 'setconfig':
                             key = current_item[2]
@@ -269,6 +269,17 @@ class DBManager:
             notmuch2.capi.lib.notmuch_messages_collect_tags)
         return [t for t in tagset]
 
+    def get_message_ids(self, querystring):
+        """
+        returns ids of all messages that match `querystring`
+
+        :rtype: set of str
+        """
+        db = Database(path=self.path, mode=Database.MODE.READ_ONLY,
+                      config=self.config)
+        return {m.messageid for m in db.messages(
+            querystring, exclude_tags=self.exclude_tags)}
+
     def count_threads(self, querystring):
         """returns number of threads that match `querystring`"""
         db = Database(path=self.path, mode=Database.MODE.READ_ONLY,
@@ -382,10 +393,21 @@ class DBManager:
         :param afterwards: callback to trigger after removing
         :type afterwards: callable or None
         """
+        self.remove_messages([message], afterwards=afterwards)
+
+    def remove_messages(self, messages, afterwards=None):
+        """
+        Remove several messages from the notmuch index in one transaction
+
+        :param messages: messages to remove
+        :type messages: list of :class:`Message`
+        :param afterwards: callback to trigger once after removing all of them
+        :type afterwards: callable or None
+        """
         if self.ro:
             raise DatabaseROError()
-        path = message.get_filename()
-        self.writequeue.append(('remove', afterwards, path))
+        paths = [message.get_filename() for message in messages]
+        self.writequeue.append(('remove', afterwards, paths))
 
     def save_named_query(self, alias, querystring, afterwards=None):
         """
@@ -3,6 +3,7 @@
 # For further details see the COPYING file
 import email
 import email.charset as charset
+import email.parser
 import email.policy
 import functools
 from datetime import datetime
@@ -45,9 +46,11 @@ class Message:
             self._datetime = None
         self._filename = str(msg.path)
         self._email = None  # will be read upon first use
+        self._headers = None  # will be read upon first use
         self._subject = None  # will be read upon first use
         self._attachments = None  # will be read upon first use
         self._mime_part = None  # will be read upon first use
+        self._body_texts = {}  # will be read upon first use
         self._mime_tree = None  # will be read upon first use
         self._tags = msg.tags
 
@@ -111,6 +114,38 @@ class Message:
                     warning, policy=email.policy.SMTP)
         return self._email
 
+    def get_headers(self):
+        """
+        returns :class:`email.email.EmailMessage` that only contains the
+        headers of this message.
+
+        Reading stops at the blank line separating headers and body, so the
+        (possibly large) body is neither read nor parsed. If the complete
+        mail has already been parsed by :meth:`get_email`, that is returned
+        instead. Only use this if the body is not needed at all, otherwise
+        the file is read twice.
+        """
+        if self._email:
+            return self._email
+        if not self._headers:
+            lines = []
+            try:
+                with open(self.get_filename(), 'rb') as f:
+                    for line in f:
+                        if line in (b'\n', b'\r\n'):
+                            break
+                        lines.append(line)
+            except IOError:
+                return self.get_email()
+            headers = email.parser.BytesHeaderParser(
+                _class=email.message.EmailMessage,
+                policy=email.policy.SMTP).parsebytes(b''.join(lines))
+            # like get_email, don't trust signature state from the file
+            del headers[utils.X_SIGNATURE_VALID_HEADER]
+            del headers[utils.X_SIGNATURE_MESSAGE_HEADER]
+            self._headers = headers
+        return self._headers
+
     def get_date(self):
         """returns Date header value as :class:`~datetime.datetime`"""
         return self._datetime
@@ -182,7 +217,8 @@ class Message:
         :rtype: str
         """
         if not self._subject:
-            self._subject = decode_header(self.get_email().get('subject', ''))
+            self._subject = decode_header(
+                self.get_headers().get('subject', ''))
         return self._subject
 
     def add_tags(self, tags, afterwards=None, remove_rest=False):
@@ -292,10 +328,15 @@ class Message:
 
     def set_mime_part(self, mime_part):
         self._mime_part = mime_part
+        self._body_texts = {}
 
     def get_body_text(self, render=True):
         """ returns bodystring extracted from this mail """
-        return extract_body_part(self.get_mime_part(), render=render)
+        # rendering may call an external mailcap handler, so only do it once
+        if render not in self._body_texts:
+            self._body_texts[render] = extract_body_part(
+                self.get_mime_part(), render=render)
+        return self._body_texts[render]
 
     def matches(self, querystring):
         """tests if this messages is in the resultset for `querystring`"""
@@ -536,12 +536,16 @@ def decode_header(header, normalize=False):
     """
     logging.debug("unquoted header: |%s|", header)
 
-    valuelist = email.header.decode_header(header)
-    decoded_list = []
-    for v, enc in valuelist:
-        v = string_decode(v, enc)
-        decoded_list.append(string_sanitize(v))
-    value = ''.join(decoded_list)
+    if isinstance(header, str) and '=?' not in header:
+        # no encoded words, so there is nothing to decode
+        value = string_sanitize(header)
+    else:
+        valuelist = email.header.decode_header(header)
+        decoded_list = []
+        for v, enc in valuelist:
+            v = string_decode(v, enc)
+            decoded_list.append(string_sanitize(v))
+        value = ''.join(decoded_list)
     if normalize:
         value = re.sub(r'\n\s+', r' ', value)
     return value
@@ -568,11 +572,34 @@ def clear_my_address(my_account, value):
     :returns: a new, potentially shortend list
     :rtype: list(str)
     """
-    new_value = []
-    for name, address in email.utils.getaddresses(value):
-        if not my_account.matches_address(address):
-            new_value.append(formataddr((name, address)))
-    return new_value
+    return [formataddr((name, address))
+            for name, address in email.utils.getaddresses(value)
+            if not my_account.matches_address(address)]
+
+
+def clear_my_address_multi(my_account, **values):
+    """return several recipient headers without the addresses in my_account
+
+    This works like :func:`clear_my_address` for every keyword argument but
+    matches each distinct address against `my_account` only once.
+
+    :param my_account: my account
+    :type my_account: :class:`Account`
+    :param values: lists of recipient or sender strings by arbitrary keywords
+    :type values: list(str)
+    :returns: the potentially shortend lists by the same keywords
+    :rtype: dict(str -> list(str))
+    """
+    mine = {}
+    cleared = {}
+    for key, value in values.items():
+        cleared[key] = []
+        for name, address in email.utils.getaddresses(value):
+            if address not in mine:
+                mine[address] = my_account.matches_address(address)
+            if not mine[address]:
+                cleared[key].append(formataddr((name, address)))
+    return cleared
 
 
 def ensure_unique_address(recipients):
@@ -580,9 +607,8 @@ def ensure_unique_address(recipients):
     clean up a list of name,address pairs so that
     no address appears multiple times.
     """
-    res = dict()
-    for name, address in email.utils.getaddresses(recipients):
-        res[address] = name
+    res = {address: name
+           for name, address in email.utils.getaddresses(recipients)}
     logging.debug(res)
     urecipients = [formataddr((n, a)) for a, n in res.items()]
     return sorted(urecipients)
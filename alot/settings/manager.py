@@ -35,6 +35,7 @@ class SettingsManager:
         self._theme = None
         self._accounts = None
         self._accountmap = None
+        self._mailinglists = None
         self._notmuchconfig = None
         self._notmuchconfig_path = None
         self._config = ConfigObj()
@@ -76,6 +77,7 @@ class SettingsManager:
                 'gpg_key_hint': checks.gpg_key})
         self._config.merge(newconfig)
         self._config.walk(self._expand_config_values)
+        self._mailinglists = None
 
         # set up hooks module if requested
         hooks_path = self._config.get('hooksfile')
@@ -273,6 +275,20 @@ class SettingsManager:
         :type value: depends on the specfile :file:`alot.rc.spec`
         """
         self._config[key] = value
+        if key == 'mailinglists':
+            self._mailinglists = None
+
+    def get_mailinglists(self):
+        """
+        returns the addresses of the mailinglists set in
+        :ref:`mailinglists <mailinglists>` in lowercase
+
+        :rtype: frozenset of str
+        """
+        if self._mailinglists is None:
+            self._mailinglists = frozenset(
+                a.lower() for a in self.get('mailinglists', []))
+        return self._mailinglists
 
     def get_notmuch_setting(self, section, key, fallback=None):
         """
@@ -486,7 +486,9 @@ class UI:
         """return the bottom most focussed widget of the widget tree"""
         if not startfrom:
             startfrom = self.current_buffer
-        if 'get_focus' in dir(startfrom):
+        # look at the class only: dir() would collect and sort all attribute
+        # names of the widget on every level of the tree
+        if hasattr(type(startfrom), 'get_focus'):
             focus = startfrom.get_focus()
             if isinstance(focus, tuple):
                 focus = focus[0]
@@ -5,69 +5,78 @@ import logging
 import re
 
 
-_b1 = r'\033\['  # Control Sequence Introducer
+# a CSI sequence is ESC [ (the Control Sequence Introducer) followed by
 _b2 = r'[0-9:;<=>?]*'  # parameter bytes
 _b3 = r'[ !\"#$%&\'()*+,-./]*'  # intermediate bytes
 _b4 = r'[A-Z[\]^_`a-z{|}~]'  # final byte"
-csi_pattern = re.compile(
-    _b1 + r'(?P<pb>' + _b2 + ')' + r'(?P<ib>' + _b3 + ')' + r'(?P<fb>' + _b4 + ')')
+
+
+# scanner used by parse_ansi_escapes: every ESC is matched exactly once, either
+# as a CSI sequence, as a string terminated by ST (e.g. the 'ESC]8' links some
+# mailcap filters create) or as an unsupported sequence in group 'bad'
+_escape_pattern = re.compile(
+    r'\033(?:'
+    r'\[(?P<pb>' + _b2 + ')' + r'(?P<ib>' + _b3 + ')' + r'(?P<fb>' + _b4 + ')'
+    r'|(?P<st>\].*?\033\\)'
+    r'|(?P<bad>.))', re.DOTALL)
 
 
 def parse_ansi_escapes(text):
     """
-    TODO: Add doc
+    split text at its ANSI escape sequences.
+
+    Yields `(code, args, infix)` tuples, where `infix` is the text following
+    the escape sequence identified by `code` and `args`. The first infix is
+    yielded with `code` and `args` set to `None`. Unsupported sequences are
+    logged and left in the text.
+
+    :param text: the text to split
+    :type text: str
+    :rtype: iterator of (str, tuple or str, str)
     """
     i = 0
-    j = 0
     code, args = None, None
-    while True:
-        j = text.find('\033', j)
-        if j == -1:
-            break
-
-        if j + 1 >= len(text):
-            break
-
-        new_code = text[j + 1]
-        if new_code == '[':
-            new_args, k = parse_csi(text, j)
-        elif new_code == ']':
-            # Some mailcap filters use the 'ESC]8...' sequence to create links.
-            # Let's just consume to make sure we either ignore or handle it
-            # properly when rendering.
-            new_args, k = parse_str_until_st(text, j)
-        else:
-            new_args = None
-
-        if new_args is None:
-            logging.warning(f'sequence for ESC {new_code} ignored: {text[j:j+10]!r}...')
-            j = j + 2
+    for m in _escape_pattern.finditer(text):
+        if m.lastgroup == 'bad':
+            j = m.start()
+            logging.warning(f'sequence for ESC {m.group("bad")} ignored: '
+                            f'{text[j:j+10]!r}...')
+            continue
+        yield code, args, text[i:m.start()]
+        if m.lastgroup == 'st':
+            code, args = ']', m.group(0)
         else:
-            yield code, args, text[i:j]
-            code, args = new_code, new_args
-            i = j = k
+            code, args = '[', m.group('pb', 'ib', 'fb')
+        i = m.end()
 
     yield code, args, text[i:]
 
 
+# like _escape_pattern, but without groups as strip_ansi_escapes only needs to
+# know where the sequences are; unsupported sequences are dropped as well
+_strip_pattern = re.compile(
+    r'\033(?:\[' + _b2 + _b3 + _b4 + r'|\].*?\033\\|.)', re.DOTALL)
+
+
 def strip_ansi_escapes(text):
     """Return text with ANSI escape sequences removed."""
-    return "".join(s for *_, s in parse_ansi_escapes(text))
+    if '\033' not in text:
+        return text
+    return _strip_pattern.sub('', text)
 
 
-def parse_csi(text, pos):
-    """
-    TODO: Add doc
-    """
-    m = csi_pattern.match(text, pos)
-    if not m:
-        return None, -1
-    pb, ib, fb = m.groups()
-    return (pb, ib, fb), m.end()
-
-
-def parse_str_until_st(text, pos):
-    i = text.find('\033\\', pos)
-    if i == -1:
-        return None, -1
-    return text[pos:i + 2], i + 2
+# the bytes variant has to drop a whole UTF-8 encoded character following an
+# unsupported ESC, like the str variant does, not just its first byte
+_strip_pattern_b = re.compile(
+    (r'\033(?:\[' + _b2 + _b3 + _b4 + r'|\].*?\033\\'
+     r'|[\xc0-\xdf][\x80-\xbf]'
+     r'|[\xe0-\xef][\x80-\xbf]{2}'
+     r'|[\xf0-\xf7][\x80-\xbf]{3}'
+     r'|.)').encode('ascii'), re.DOTALL)
+
+
+def strip_ansi_escapes_bytes(data):
+    """Return bytes with ANSI escape sequences removed."""
+    if b'\033' not in data:
+        return data
+    return _strip_pattern_b.sub(b'', data)
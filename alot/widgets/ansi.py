@@ -35,30 +35,33 @@ class ANSIText(urwid.WidgetWrap):
         return key
 
 
+# SGR parameters mapped to the attribute they set
 ECODES = {
-    '1': {'bold': True},
-    '3': {'italics': True},
-    '4': {'underline': True},
-    '5': {'blink': True},
-    '7': {'standout': True},
-    '9': {'strikethrough': True},
-    '30': {'fg': 'black'},
-    '31': {'fg': 'dark red'},
-    '32': {'fg': 'dark green'},
-    '33': {'fg': 'brown'},
-    '34': {'fg': 'dark blue'},
-    '35': {'fg': 'dark magenta'},
-    '36': {'fg': 'dark cyan'},
-    '37': {'fg': 'light gray'},
-    '40': {'bg': 'black'},
-    '41': {'bg': 'dark red'},
-    '42': {'bg': 'dark green'},
-    '43': {'bg': 'brown'},
-    '44': {'bg': 'dark blue'},
-    '45': {'bg': 'dark magenta'},
-    '46': {'bg': 'dark cyan'},
-    '47': {'bg': 'light gray'},
+    1: ('bold', True),
+    3: ('italics', True),
+    4: ('underline', True),
+    5: ('blink', True),
+    7: ('standout', True),
+    9: ('strikethrough', True),
+    30: ('fg', 'black'),
+    31: ('fg', 'dark red'),
+    32: ('fg', 'dark green'),
+    33: ('fg', 'brown'),
+    34: ('fg', 'dark blue'),
+    35: ('fg', 'dark magenta'),
+    36: ('fg', 'dark cyan'),
+    37: ('fg', 'light gray'),
+    40: ('bg', 'black'),
+    41: ('bg', 'dark red'),
+    42: ('bg', 'dark green'),
+    43: ('bg', 'brown'),
+    44: ('bg', 'dark blue'),
+    45: ('bg', 'dark magenta'),
+    46: ('bg', 'dark cyan'),
+    47: ('bg', 'light gray'),
 }
+# ECODES as a list indexed by parameter, None for other parameters
+_ECODES_TABLE = [ECODES.get(code) for code in range(max(ECODES) + 1)]
 
 URWID_MODS = [
     'bold',
@@ -82,9 +85,15 @@ def parse_escapes_to_urwid(text, default_attr=None, default_attr_focus=None,
     See https://en.wikipedia.org/wiki/ANSI_escape_code#CSI_sequences
     """
     # these two will be returned
-    urwid_text = []  # we will accumulate text (with attributes) here
+    # we will accumulate text (with attributes) here. Each run of infixes
+    # sharing an attribute is kept as a list of strings that is only joined
+    # at the end, extending a str for each infix would copy the run every time
+    urwid_text = []
     # mapping from included attributes to focused attr
     urwid_focus = {None: default_attr_focus}
+    # AttrSpecs already created for an urwid (fg, bg) pair; colored text
+    # typically switches between only a few of them
+    attr_cache = {}
 
     # Escapes are cumulative so we always keep previous values until it's
     # changed by another escape.
@@ -106,9 +115,19 @@ def parse_escapes_to_urwid(text, default_attr=None, default_attr_focus=None,
                 urwid_fg += ',' + mod
         if parse_background:
             urwid_bg = attr['bg']
-        urwid_attr = urwid.AttrSpec(urwid_fg, urwid_bg)
-        urwid_focus[urwid_attr] = default_attr_focus
-        urwid_text.append((urwid_attr, infix))
+        urwid_attr = attr_cache.get((urwid_fg, urwid_bg))
+        if urwid_attr is None:
+            urwid_attr = urwid.AttrSpec(urwid_fg, urwid_bg)
+            attr_cache[(urwid_fg, urwid_bg)] = urwid_attr
+            urwid_focus[urwid_attr] = default_attr_focus
+        if urwid_text and urwid_text[-1][0] is urwid_attr:
+            # the escape didn't change the theme, extend the previous run
+            urwid_text[-1][1].append(infix)
+        else:
+            urwid_text.append((urwid_attr, [infix]))
+
+    def joined_text():
+        return [(urwid_attr, ''.join(run)) for urwid_attr, run in urwid_text]
 
     def reset_attr():
         attr.clear()
@@ -123,46 +142,49 @@ def parse_escapes_to_urwid(text, default_attr=None, default_attr_focus=None,
 
             # Several attributes can be set in the same sequence,
             # separated by semicolons.
-            param_iter = ("0" if v == "" else v for v in pb.split(";"))
-            while True:
+            params = [v or "0" for v in pb.split(";")]
+            n = len(params)
+            i = 0
+            while i < n:
+                param = params[i]
+                i += 1
                 try:
-                    param = next(param_iter)
-                except StopIteration:
-                    # Done consuming parameters.
-                    break
+                    code = int(param)
+                except ValueError:
+                    code = -1
 
-                if param == "" or param == "0":
+                if code == 0:
                     reset_attr()
-                elif param in ECODES:
-                    attr.update(ECODES[param])
-                elif param in ('38', '48', '58'):
+                elif 0 < code < len(_ECODES_TABLE) and _ECODES_TABLE[code]:
+                    key, value = _ECODES_TABLE[code]
+                    attr[key] = value
+                elif code in (38, 48, 58):
                     # Foreground (38), background (48) or underline (58) colour.
                     # The underline one is currently not supported, but we at
                     # least parse it for completeness.
-                    try:
-                        color_type = next(param_iter)
-                    except StopIteration:
+                    if i >= n:
                         logging.warning(f'{pb!r}: color param {param} requires arguments')
                         break
+                    color_type = params[i]
+                    i += 1
 
                     attr_name = ''
                     attr_value = ''
 
                     if color_type == '5':
                         # 8-bit index
-                        try:
-                            color_index = next(param_iter)
-                        except StopIteration:
+                        if i >= n:
                             logging.warning(f'{pb!r}: missing 8-bit color index')
                             break
-                        attr_value = 'h' + color_index
+                        attr_value = 'h' + params[i]
+                        i += 1
                     elif color_type == '2':
                         # RGB
-                        try:
-                            r, g, b = next(param_iter), next(param_iter), next(param_iter)
-                        except StopIteration:
+                        if i + 3 > n:
                             logging.warning(f'{pb!r}: missing RGB components')
                             break
+                        r, g, b = params[i:i + 3]
+                        i += 3
 
                         try:
                             r, g, b = int(r), int(g), int(b)
@@ -173,9 +195,9 @@ def parse_escapes_to_urwid(text, default_attr=None, default_attr_focus=None,
                     else:
                         logging.warning(f'{pb!r}: color type {color_type} ignored')
 
-                    if param == '38':
+                    if code == 38:
                         attr_name = 'fg'
-                    elif param == '48':
+                    elif code == 48:
                         attr_name = 'bg'
                     else:
                         attr_name = ''
@@ -186,10 +208,15 @@ def parse_escapes_to_urwid(text, default_attr=None, default_attr_focus=None,
                 else:
                     logging.warning(f'{pb!r}: parameter {param} ignored')
 
+    if '\033' not in text:
+        # most texts are not colored at all, no need to run the parser
+        append_themed_infix(text)
+        return joined_text(), urwid_focus
+
     for code, args, infix in ansi.parse_ansi_escapes(text):
         if code == '[':
             pb, ib, fb = args
             update_attr(pb, ib, fb)
         append_themed_infix(infix)
 
-    return urwid_text, urwid_focus
+    return joined_text(), urwid_focus
@@ -187,6 +187,7 @@ class MessageTree(CollapsibleTree):
         self.display_attachments = True
         self._mimetree = None
         self._attachments = None
+        self._assembled = False
         self._maintree = SimpleTree(self._assemble_structure(True))
         self.display_mimetree = False
         CollapsibleTree.__init__(self, self._maintree)
@@ -196,10 +197,16 @@ class MessageTree(CollapsibleTree):
 
     def reassemble(self):
         self._maintree._treelist = self._assemble_structure()
+        self._assembled = True
 
     def refresh(self):
         self._summaryw = None
-        self.reassemble()
+        if self._assembled:
+            self.reassemble()
+        else:
+            # only the summary has been created so far, don't read the
+            # message file just to refresh it. expand() assembles the rest.
+            self._maintree._treelist = self._assemble_structure(True)
 
     def debug(self):
         logging.debug('collapsed %s', self.is_collapsed(self.root))
@@ -5,6 +5,7 @@
 
 """Test suite for alot.commands.thread module."""
 import email
+import email.policy
 import unittest
 from unittest import mock
 
@@ -151,3 +152,98 @@ class TestDetermineSender(unittest.TestCase):
         expected = ('to+some_tag@example.com', account2)
         self._test(accounts=[account1, account2, account3], expected=expected,
                    mail=mail)
+
+    def test_account_order_is_more_important_than_address_order(self):
+        account1 = _AccountTestClass(address='foo@example.com')
+        account2 = _AccountTestClass(address='bar@example.com',
+                                     alias_regexp=r'bar\+.*@example.com')
+        account3 = _AccountTestClass(address='to@example.com')
+        mailstring = self.mailstring.replace(
+            'To: to@example.com',
+            'To: to@example.com, bar+tag@example.com')
+        mail = email.message_from_string(mailstring)
+        expected = ('bar+tag@example.com', account2)
+        self._test(accounts=[account1, account2, account3], expected=expected,
+                   mail=mail)
+
+    def test_collected_headers_are_used_if_given(self):
+        account1 = _AccountTestClass(address='foo@example.com')
+        account2 = _AccountTestClass(address='cc@example.com')
+        headers = thread._HeaderSnapshot(email.message_from_string(
+            'Cc: cc@example.com\n\n', policy=email.policy.SMTP))
+        mail = email.message_from_string('Subject: no recipients\n\n')
+        expected = ('cc@example.com', account2)
+        with mock.patch('alot.commands.thread.settings.get_accounts',
+                        mock.Mock(return_value=[account1, account2])):
+            with mock.patch('alot.commands.thread.settings.get',
+                            lambda arg: self.header_priority
+                            if arg == 'reply_account_header_priority'
+                            else False):
+                actual = thread.determine_sender(mail, headers=headers)
+        self.assertTupleEqual(actual, expected)
+
+
+class TestHeaderSnapshot(unittest.TestCase):
+
+    mailstring = (
+        'Received: from a\n'
+        'Received: from b\n'
+        'To: to@example.com\n'
+        'Cc: one@example.com\n'
+        'CC: two@example.com\n'
+        '\n')
+
+    def test_values_are_collected_case_insensitively(self):
+        mail = email.message_from_string(self.mailstring,
+                                         policy=email.policy.SMTP)
+        headers = thread._HeaderSnapshot(mail)
+        self.assertIn('cc', headers)
+        self.assertNotIn('from', headers)
+        self.assertListEqual(headers.get('Cc'),
+                             ['one@example.com', 'two@example.com'])
+        self.assertIsNone(headers.get('from'))
+
+    def test_only_requested_headers_are_parsed(self):
+        mail = mock.Mock()
+        mail.raw_items.return_value = [('Received', 'from a'),
+                                       ('To', 'to@example.com')]
+        headers = thread._HeaderSnapshot(mail)
+        headers.get('to')
+        headers.get('to')
+        mail.policy.header_fetch_parse.assert_called_once_with(
+            'To', 'to@example.com')
+
+
+class TestPipeCommand(unittest.TestCase):
+
+    def _pipestring(self, mailstring, **kwargs):
+        mail = email.message_from_bytes(mailstring,
+                                        policy=email.policy.SMTP)
+        msg = mock.Mock()
+        msg.get_email = mock.Mock(return_value=mail)
+        cmd = thread.PipeCommand('cat', **kwargs)
+        return cmd._get_pipestring(msg)
+
+    def test_raw_mails_are_piped_as_is(self):
+        mailstring = (
+            b'Subject: 8bit\r\n'
+            b'Content-Type: text/plain; charset="UTF-8"\r\n'
+            b'Content-Transfer-Encoding: 8bit\r\n'
+            b'\r\n'
+            b'Gr\xc3\xbc\xc3\x9fe\r\n')
+        self.assertEqual(self._pipestring(mailstring), mailstring)
+
+    def test_simple_commands_are_run_without_shell(self):
+        cmd = thread.PipeCommand(['lpr -P office'])
+        self.assertListEqual(cmd._argv, ['lpr', '-P', 'office'])
+
+    def test_commands_using_shell_features_are_run_by_shell(self):
+        for cmdstring in ['a2ps | lpr', 'less > out', 'cat $HOME/x',
+                          'LANG=C lpr', 'lpr -P "office"',
+                          "lpr -P 'office'"]:
+            cmd = thread.PipeCommand([cmdstring])
+            self.assertIsNone(cmd._argv, cmdstring)
+
+    def test_commands_are_run_by_shell_if_asked_to(self):
+        cmd = thread.PipeCommand(['lpr', '-P', 'office'], shell=True)
+        self.assertIsNone(cmd._argv)
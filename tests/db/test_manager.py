@@ -8,6 +8,7 @@ import os
 import shutil
 import tempfile
 import textwrap
+import unittest
 from unittest import mock
 
 from alot.db.manager import DBManager
@@ -59,3 +60,43 @@ class TestDBManager(utilities.TestCaseClassCleanup):
 
             named_queries_dict = self.manager.get_named_queries()
             self.assertDictEqual(named_queries_dict, {alias: querystring})
+
+
+class TestRemoveMessages(unittest.TestCase):
+
+    def test_messages_are_removed_in_one_write(self):
+        manager = DBManager('/path/to/db')
+        messages = [mock.Mock(), mock.Mock(), mock.Mock()]
+        for i, msg in enumerate(messages):
+            msg.get_filename.return_value = '/mail/%d' % i
+        afterwards = mock.Mock()
+
+        manager.remove_messages(messages, afterwards=afterwards)
+        self.assertEqual(len(manager.writequeue), 1)
+
+        with mock.patch('alot.db.manager.Database') as database, \
+                mock.patch.object(settings, 'get_notmuch_setting',
+                                  return_value=False):
+            manager.flush()
+        db = database.return_value
+        self.assertListEqual(db.remove.call_args_list,
+                             [mock.call('/mail/0'), mock.call('/mail/1'),
+                              mock.call('/mail/2')])
+        afterwards.assert_called_once_with()
+        self.assertEqual(len(manager.writequeue), 0)
+
+
+class TestGetMessageIds(unittest.TestCase):
+
+    def test_ids_of_matching_messages_are_returned(self):
+        manager = DBManager('/path/to/db')
+        with mock.patch('alot.db.manager.Database') as database, \
+                mock.patch.object(settings, 'get', return_value=['spam']):
+            db = database.return_value
+            db.messages.return_value = [
+                mock.Mock(messageid='a@example.com'),
+                mock.Mock(messageid='b@example.com')]
+            ids = manager.get_message_ids('tag:inbox')
+        db.messages.assert_called_once_with('tag:inbox',
+                                            exclude_tags=['spam'])
+        self.assertSetEqual(ids, {'a@example.com', 'b@example.com'})
@@ -14,6 +14,8 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import os
+import tempfile
 import unittest
 from unittest import mock
 
@@ -120,3 +122,61 @@ class TestMessage(unittest.TestCase):
                         mock.Mock(return_value=[acc])):
             msg = message.Message(mock.Mock(), MockNotmuchMessage())
         self.assertEqual(msg.get_author(), ('Unknown', ''))
+
+    def test_get_body_text_is_cached_per_render_mode(self):
+        """Message.get_body_text extracts the text once for each render mode
+        and again after the mime part was changed.
+        """
+        msg = message.Message(mock.Mock(), MockNotmuchMessage())
+        msg.set_mime_part(mock.sentinel.part)
+        with mock.patch('alot.db.message.extract_body_part',
+                        side_effect=lambda part, render: (part, render)) \
+                as extract:
+            self.assertEqual(msg.get_body_text(),
+                             (mock.sentinel.part, True))
+            self.assertEqual(msg.get_body_text(render=False),
+                             (mock.sentinel.part, False))
+            msg.get_body_text()
+            msg.get_body_text(render=False)
+            self.assertEqual(extract.call_count, 2)
+
+            msg.set_mime_part(mock.sentinel.other)
+            self.assertEqual(msg.get_body_text(),
+                             (mock.sentinel.other, True))
+            self.assertEqual(extract.call_count, 3)
+
+    def test_get_headers_does_not_read_body(self):
+        """Message.get_headers only parses the header block of the mail file.
+        """
+        nmmsg = MockNotmuchMessage()
+        nmmsg.mock_filename = os.path.join(
+            os.path.dirname(__file__), '..', 'static', 'mail', 'utf8.eml')
+        msg = message.Message(mock.Mock(), nmmsg)
+        headers = msg.get_headers()
+        self.assertEqual(headers['Subject'], 'plain utf8 8bit message')
+        self.assertEqual(headers.get_payload(), '')
+        self.assertIsNone(msg._email)
+
+    def test_get_headers_drops_signature_state_headers(self):
+        """Message.get_headers doesn't trust signature state in the file.
+        """
+        with tempfile.NamedTemporaryFile(suffix='.eml') as f:
+            f.write(b'Subject: forged\n'
+                    b'X-Alot-OpenPGP-Signature-Valid: True\n'
+                    b'X-Alot-OpenPGP-Signature-Message: trust me\n'
+                    b'\n'
+                    b'body\n')
+            f.flush()
+            nmmsg = MockNotmuchMessage()
+            nmmsg.mock_filename = f.name
+            headers = message.Message(mock.Mock(), nmmsg).get_headers()
+        self.assertEqual(headers['Subject'], 'forged')
+        self.assertNotIn('X-Alot-OpenPGP-Signature-Valid', headers)
+        self.assertNotIn('X-Alot-OpenPGP-Signature-Message', headers)
+
+    def test_get_headers_prefers_parsed_email(self):
+        """Message.get_headers returns the full mail if it was parsed before.
+        """
+        msg = message.Message(mock.Mock(), MockNotmuchMessage())
+        msg._email = mock.sentinel.email
+        self.assertIs(msg.get_headers(), mock.sentinel.email)
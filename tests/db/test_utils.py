@@ -903,6 +903,13 @@ class TestClearMyAddress(unittest.TestCase):
         actual = utils.clear_my_address(self.mine, input_)
         self.assertListEqual(actual, expected)
 
+    def test_multiple_lists_are_cleared_by_keyword(self):
+        expected = {'to': [self.you], 'cc': [self.named], 'bcc': []}
+        actual = utils.clear_my_address_multi(
+            self.mine, to=[self.me1, self.you], cc=[self.named, self.me3],
+            bcc=[self.me_named])
+        self.assertDictEqual(actual, expected)
+
 
 class TestFormataddr(unittest.TestCase):
 
@@ -197,6 +197,17 @@ class TestSettingsManager(unittest.TestCase):
         manager.read_config(f.name)
         self.assertEqual(manager.get_tagstring_representation(tag)['translated'], translated_goal)
 
+    def test_mailinglists_are_lowercased_and_updated_on_set(self):
+        with tempfile.NamedTemporaryFile(mode='w+', delete=False) as f:
+            f.write('mailinglists = List@example.com, other@example.com\n')
+        self.addCleanup(os.unlink, f.name)
+        manager = SettingsManager()
+        manager.read_config(f.name)
+        self.assertEqual(manager.get_mailinglists(),
+                         {'list@example.com', 'other@example.com'})
+        manager.set('mailinglists', ['new@example.com'])
+        self.assertEqual(manager.get_mailinglists(), {'new@example.com'})
+
 class TestSettingsManagerExpandEnvironment(unittest.TestCase):
     """ Tests SettingsManager._expand_config_values """
     setting_name = 'template_dir'
@@ -0,0 +1,60 @@
+# encoding=utf-8
+# This file is released under the GNU GPL, version 3 or a later revision.
+# For further details see the COPYING file
+
+import unittest
+
+from alot.utils import ansi
+
+# Good descriptive test names often don't fit PEP8, which is meant to cover
+# functions meant to be called by humans.
+# pylint: disable=invalid-name
+
+
+class TestParseAnsiEscapes(unittest.TestCase):
+
+    def test_text_without_escapes_is_a_single_infix(self):
+        parsed = list(ansi.parse_ansi_escapes('plain text'))
+        self.assertEqual(parsed, [(None, None, 'plain text')])
+
+    def test_csi_sequences_are_split(self):
+        parsed = list(ansi.parse_ansi_escapes('a\033[1;31mb\033[0mc'))
+        self.assertEqual(parsed, [
+            (None, None, 'a'),
+            ('[', ('1;31', '', 'm'), 'b'),
+            ('[', ('0', '', 'm'), 'c'),
+        ])
+
+    def test_strings_terminated_by_st_are_consumed(self):
+        link = '\033]8;;https://example.com\033\\'
+        parsed = list(ansi.parse_ansi_escapes('a' + link + 'b'))
+        self.assertEqual(parsed, [(None, None, 'a'), (']', link, 'b')])
+
+    def test_unsupported_sequences_are_kept(self):
+        with self.assertLogs(level='WARNING'):
+            parsed = list(ansi.parse_ansi_escapes('a\033Xb\033[mc'))
+        self.assertEqual(parsed, [
+            (None, None, 'a\033Xb'),
+            ('[', ('', '', 'm'), 'c'),
+        ])
+
+
+class TestStripAnsiEscapes(unittest.TestCase):
+
+    def test_escapes_are_removed(self):
+        text = '\033[1mbold\033[0m and \033]8;;x\033\\link'
+        self.assertEqual(ansi.strip_ansi_escapes(text), 'bold and link')
+
+    def test_unsupported_sequences_are_removed(self):
+        text = 'a\033Xb\033[31mc'
+        self.assertEqual(ansi.strip_ansi_escapes(text), 'abc')
+
+    def test_escapes_are_removed_from_bytes(self):
+        data = b'\033[1mbold\033[0m \xc3\xa4'
+        self.assertEqual(ansi.strip_ansi_escapes_bytes(data), b'bold \xc3\xa4')
+
+    def test_bytes_and_str_variants_strip_the_same(self):
+        for text in ['x\033äy', 'x\033€y', 'x\033\U0001d11ey',
+                     '\033[31mä\033]8;;ü\033\\ö']:
+            self.assertEqual(ansi.strip_ansi_escapes_bytes(text.encode()),
+                             ansi.strip_ansi_escapes(text).encode())
@@ -0,0 +1,57 @@
+# encoding=utf-8
+# This file is released under the GNU GPL, version 3 or a later revision.
+# For further details see the COPYING file
+
+"""Tests for the alot.widgets.ansi module."""
+
+import unittest
+
+import urwid
+
+from alot.widgets import ansi
+
+
+class TestParseEscapesToUrwid(unittest.TestCase):
+
+    default_attr = urwid.AttrSpec('default', 'default')
+    default_attr_focus = urwid.AttrSpec('white', 'dark blue')
+
+    def _parse(self, text):
+        return ansi.parse_escapes_to_urwid(text, self.default_attr,
+                                           self.default_attr_focus)
+
+    def test_sgr_parameters_are_translated(self):
+        markup, _ = self._parse('\033[1;31mred\033[0m plain')
+        self.assertEqual(
+            [(a.foreground, a.background, t) for a, t in markup],
+            [('dark red,bold', 'default', 'red'),
+             ('default', 'default', ' plain')])
+
+    def test_attributes_are_shared_by_equally_themed_infixes(self):
+        markup, focus_map = self._parse('a\033[31mb\033[0mc\033[31md')
+        self.assertIs(markup[0][0], markup[2][0])
+        self.assertIs(markup[1][0], markup[3][0])
+        self.assertEqual(len(focus_map), 3)
+
+    def test_equally_themed_neighbours_are_merged(self):
+        markup, _ = self._parse('\033[31ma\033[0;31mb\033[32mc')
+        self.assertEqual(
+            [(a.foreground, t) for a, t in markup],
+            [('dark red', 'ab'), ('dark green', 'c')])
+
+    def test_text_without_escapes_uses_default_attribute(self):
+        markup, focus_map = self._parse('plain text')
+        self.assertEqual(
+            [(a.foreground, a.background, t) for a, t in markup],
+            [('default', 'default', 'plain text')])
+        self.assertEqual(len(focus_map), 2)
+
+    def test_parameters_are_compared_numerically(self):
+        markup, _ = self._parse('\033[01;031mred')
+        self.assertEqual(markup[0][0].foreground, 'dark red,bold')
+
+    def test_many_equally_themed_neighbours_form_a_single_run(self):
+        markup, _ = self._parse('\033[31mabc' * 10000)
+        self.assertEqual(len(markup), 1)
+        self.assertEqual(markup[0][0].foreground, 'dark red')
+        self.assertEqual(markup[0][1], 'abc' * 10000)
@@ -0,0 +1,40 @@
+# encoding=utf-8
+# This file is released under the GNU GPL, version 3 or a later revision.
+# For further details see the COPYING file
+
+"""Tests for the alot.widgets.thread module."""
+
+import unittest
+from unittest import mock
+
+import urwid
+
+from alot.widgets import thread
+
+
+class TestMessageTree(unittest.TestCase):
+
+    def _messagetree(self, message):
+        with mock.patch.object(thread.MessageTree, '_get_summary',
+                               return_value=urwid.Text('summary')):
+            mt = thread.MessageTree(message)
+        return mt
+
+    def test_refresh_does_not_assemble_unexpanded_messages(self):
+        message = mock.Mock()
+        mt = self._messagetree(message)
+        with mock.patch.object(mt, '_get_summary',
+                               return_value=urwid.Text('summary')), \
+                mock.patch.object(mt, 'reassemble') as reassemble:
+            mt.refresh()
+        reassemble.assert_not_called()
+        self.assertEqual(message.mock_calls, [])
+
+    def test_refresh_reassembles_expanded_messages(self):
+        mt = self._messagetree(mock.Mock())
+        with mock.patch.object(mt, '_assemble_structure',
+                               return_value=[]) as assemble:
+            mt.reassemble()
+            mt.refresh()
+        assemble.assert_called_with()
+        self.assertEqual(assemble.call_count, 2)